@@ -1,22 +1,91 @@
 import sys
 import os
 import json
-import chardet
+import mmap
+import ctypes
+import time
+import logging
+from logging.handlers import RotatingFileHandler
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import keyboard
-from PyQt6.QtGui import QTextOption
+try:
+    import cchardet as _chardet  # C 实现，大文件检测快得多
+except ImportError:
+    import chardet as _chardet
+try:
+    import orjson  # C 实现的 JSON 序列化，可选
+except ImportError:
+    orjson = None
+from PyQt6.QtGui import QTextOption, QTextCursor, QTextDocument
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QVBoxLayout, QPushButton,
-    QColorDialog, QHBoxLayout, QTextEdit, QAbstractSlider, QFontDialog,
-    QComboBox, QCheckBox, QMessageBox, QListWidget, QSplitter
+    QColorDialog, QHBoxLayout, QPlainTextEdit, QAbstractSlider, QFontDialog,
+    QComboBox, QCheckBox, QMessageBox, QListWidget, QSplitter, QPlainTextDocumentLayout
 )
-from PyQt6.QtGui import QFont, QMouseEvent, QKeyEvent, QResizeEvent
-from PyQt6.QtCore import Qt, QPoint, QTimer
+from PyQt6.QtGui import QFont, QMouseEvent, QKeyEvent, QResizeEvent, QPalette, QColor, QShortcut, QKeySequence
+from PyQt6.QtCore import Qt, QPoint, QTimer, QObject, QRunnable, QThreadPool, QCoreApplication, pyqtSignal
 import re
 
+logger = logging.getLogger(__name__)
+
 # --- 配置加载和存储辅助 ---
 
 CONFIG_PATH = "config.json"
 CACHE_PATH = "encoding_cache.json"
+PROGRESS_PATH = "progress.json"
+LOG_PATH = "reader.log"
+ENCODING_SNIFF_SIZE = 64 * 1024  # 编码检测只需要文件开头的一段
+FONT_CACHE_SIZE = 30  # 最多缓存的 QFont 数量
+PAGE_TURN_MIN_INTERVAL = 0.04  # 按住翻页键自动重复时，两次翻页之间的最小间隔（秒）
+
+# 配置修改后只置脏标记，由主窗口的定时器批量写盘
+_config_dirty = False
+_last_saved_hashes = {}  # 文件路径 -> 上次写入内容的哈希，内容未变时跳过写盘
+
+# 常见的章节标题模式，合并为一个正则
+_CHAPTER_RE = re.compile(
+    r'^(?:第[零一二三四五六七八九十百千0-9]+[章节]\s*.+'
+    r'|Chapter\s+\d+.+'
+    r'|\d+[\s\.、]+.+'
+    r'|[零一二三四五六七八九十百千]+[\s、\.]+.+)',
+    re.IGNORECASE
+)
+
+# Windows 下用系统 RegisterHotKey 注册全局热键，其他平台使用 keyboard 库
+if sys.platform == "win32":
+    import ctypes.wintypes
+    _USER32 = ctypes.windll.user32
+else:
+    _USER32 = None
+
+WM_HOTKEY = 0x0312
+_WIN_MODIFIERS = {"alt": 0x0001, "ctrl": 0x0002, "shift": 0x0004}
+_WIN_VIRTUAL_KEYS = {"up": 0x26, "down": 0x28, "d": 0x44, "m": 0x4D, "s": 0x53}
+
+def _parse_win_hotkey(hotkey):
+    """把 'alt+up' 形式的热键转换为 RegisterHotKey 需要的 (修饰键, 虚拟键码)"""
+    *modifiers, key = hotkey.split('+')
+    flags = 0
+    for modifier in modifiers:
+        flags |= _WIN_MODIFIERS[modifier]
+    return flags, _WIN_VIRTUAL_KEYS[key]
+
+# 行首（忽略空白）是章节标题可能的开头字符，用于在全文中快速筛选候选行
+_CHAPTER_CANDIDATE_RE = re.compile(
+    r'^[^\S\n]*(?:第|chapter|\d|[零一二三四五六七八九十百千])',
+    re.IGNORECASE | re.MULTILINE
+)
+
+_BLACK_COLOR_NAMES = frozenset({"#000000", "black"})
+_RGB_DIGITS_RE = re.compile(r'\d+')
+
+# BOM 前缀 -> 编码，命中时无需调用检测器
+_BOM_ENCODINGS = (
+    (b'\xef\xbb\xbf', 'utf-8-sig'),
+    (b'\xff\xfe', 'utf-16'),
+    (b'\xfe\xff', 'utf-16'),
+)
 
 def load_config():
     """读取 JSON 配置文件，并为新选项提供默认值"""
@@ -41,6 +110,7 @@ def load_config():
         "reading_progress": {}
     }
 
+    config = default_config
     try:
         if os.path.exists(CONFIG_PATH):
             with open(CONFIG_PATH, "r", encoding="utf-8") as f:
@@ -48,81 +118,274 @@ def load_config():
                 # 合并默认配置，确保所有键都存在
                 for key, value in default_config.items():
                     config.setdefault(key, value)
-                return config
-        else:
-            return default_config
     except Exception as e:
-        print(f"加载配置失败: {e}，使用默认配置")
-        return default_config
-
-def save_config(config):
-    """保存配置到JSON文件"""
+        logger.warning("加载配置失败: %s，使用默认配置", e)
+        config = default_config
+
+    # 阅读进度单独存放在 progress.json（文本块序号）；
+    # 旧版本写在 config.json 里的进度是像素值，记下来等打开对应的书时再换算
+    progress_map = _load_progress_map()
+    pixel_progress = dict(config.get("legacy_pixel_progress") or {})
+    for path, value in (config.pop("reading_progress", None) or {}).items():
+        if isinstance(value, str) and value.isdigit():
+            value = int(value)
+        if isinstance(value, int) and path not in progress_map:
+            pixel_progress[path] = value
+    if pixel_progress:
+        config["legacy_pixel_progress"] = pixel_progress
+    config["reading_progress"] = progress_map
+    return config
+
+def _load_progress_map():
+    """读取单独存放的阅读进度文件"""
+    if not os.path.exists(PROGRESS_PATH):
+        return {}
+    try:
+        with open(PROGRESS_PATH, "r", encoding="utf-8") as f:
+            progress_map = json.load(f)
+            return progress_map if isinstance(progress_map, dict) else {}
+    except Exception as e:
+        logger.warning("加载阅读进度失败: %s", e)
+        return {}
+
+def _json_dumps(data, compact=False):
+    """把数据序列化为 UTF-8 字节，安装了 orjson 时优先使用"""
+    if orjson is not None:
+        return orjson.dumps(data) if compact else orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, indent=4).encode('utf-8')
+
+def _write_atomic(path, data):
+    """先写入临时文件再替换原文件，写到一半崩溃也不会损坏原有内容"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _write_if_changed(path, data):
+    """内容与上次写入的不同时才写文件"""
+    data_hash = hash(data)
+    if _last_saved_hashes.get(path) != data_hash:
+        _write_atomic(path, data)
+        _last_saved_hashes[path] = data_hash
+
+def write_config_files(config):
+    """把配置写入磁盘，阅读进度以紧凑格式单独写入 progress.json（可在后台线程调用）"""
     try:
-        with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-            json.dump(config, f, ensure_ascii=False, indent=4)
+        settings = {key: value for key, value in config.items() if key != "reading_progress"}
+        _write_if_changed(CONFIG_PATH, _json_dumps(settings))
+        _write_if_changed(PROGRESS_PATH, _json_dumps(config.get("reading_progress", {}), compact=True))
     except Exception as e:
-        print(f"保存配置失败: {e}")
+        logger.error("保存配置失败: %s", e)
+
+def snapshot_config(config):
+    """复制一份配置交给后台线程写盘，避免与界面线程同时修改同一个字典"""
+    snapshot = dict(config)
+    snapshot["reading_progress"] = dict(config.get("reading_progress", {}))
+    return snapshot
+
+def mark_config_dirty():
+    """标记配置已修改，由定时器统一写入磁盘"""
+    global _config_dirty
+    _config_dirty = True
+
+def take_config_dirty():
+    """返回配置是否有尚未写入磁盘的修改，并清除标记"""
+    global _config_dirty
+    dirty, _config_dirty = _config_dirty, False
+    return dirty
+
+# 编码缓存只在首次使用时读取一次，之后仅在内容变化时写回
+_encoding_cache = None
+
+def _get_encoding_cache():
+    """返回进程内的编码缓存字典，首次调用时从文件加载"""
+    global _encoding_cache
+    if _encoding_cache is None:
+        _encoding_cache = {}
+        if os.path.exists(CACHE_PATH):
+            try:
+                with open(CACHE_PATH, 'r', encoding='utf-8') as cache_file:
+                    _encoding_cache = json.load(cache_file)
+            except:
+                _encoding_cache = {}
+    return _encoding_cache
+
+def _detect_encoding(raw_data):
+    """根据文件开头的字节判断编码，优先识别 BOM"""
+    for bom, encoding in _BOM_ENCODINGS:
+        if raw_data.startswith(bom):
+            return encoding
+
+    encoding = (_chardet.detect(raw_data) or {}).get('encoding') or 'utf-8'
+    # 只检测了开头部分，后文可能出现超出检测结果范围的字符，换成兼容的超集
+    lowered = encoding.lower()
+    if lowered == 'ascii':
+        return 'utf-8'
+    if lowered in ('gb2312', 'gbk'):
+        return 'gb18030'
+    return encoding
 
 def get_file_encoding(file_path):
     """使用 chardet 检测文件编码并缓存"""
-    cache = {}
-    if os.path.exists(CACHE_PATH):
-        try:
-            with open(CACHE_PATH, 'r', encoding='utf-8') as cache_file:
-                cache = json.load(cache_file)
-        except:
-            cache = {}
-
+    cache = _get_encoding_cache()
     try:
         file_mtime = os.path.getmtime(file_path)
         if file_path in cache and cache[file_path].get('mtime') == file_mtime:
             return cache[file_path]['encoding']
     except FileNotFoundError:
-        print(f"错误: 文本文件 '{file_path}' 未找到。")
+        logger.error("文本文件 '%s' 未找到。", file_path)
         return 'utf-8'
 
     try:
         with open(file_path, 'rb') as f:
-            raw_data = f.read()
-            result = chardet.detect(raw_data)
-            encoding = result['encoding'] or 'utf-8'
+            raw_data = f.read(ENCODING_SNIFF_SIZE)
+            encoding = _detect_encoding(raw_data)
 
-            cache[file_path] = {'encoding': encoding, 'mtime': file_mtime}
-            with open(CACHE_PATH, 'w', encoding='utf-8') as cache_file:
-                json.dump(cache, cache_file, ensure_ascii=False, indent=4)
+            entry = {'encoding': encoding, 'mtime': file_mtime}
+            if cache.get(file_path) != entry:
+                cache[file_path] = entry
+                _write_atomic(CACHE_PATH, _json_dumps(cache))
             return encoding
     except Exception as e:
-        print(f"检测编码失败: {e}")
+        logger.warning("检测编码失败: %s", e)
         return 'utf-8'
 
-def calculate_luminance(color_hex):
-    """计算颜色的亮度（0-1之间），用于确定字体颜色应该用黑色还是白色"""
-    if color_hex.lower() == "transparent":
-        return 0.5
+def read_text_file(file_path, encoding):
+    """通过 mmap 一次性解码文本文件，返回全文字符串"""
+    try:
+        if not os.path.exists(file_path):
+            return f"错误：文件 '{file_path}' 不存在。\n\n请在配置文件中设置正确的文件路径。"
 
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ""
+            # 直接从映射内存解码，省去文件缓冲层和中间的 bytes 副本
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                text = str(mm, encoding, 'ignore')
+    except Exception as e:
+        logger.error("读取文件 '%s' 错误: %s", file_path, e)
+        return f"错误：无法加载文本文件。\n{str(e)}"
+
+    # 与文本模式读取保持一致，统一换行符
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+def find_chapters(text):
+    """在全文中识别章节标题，返回章节列表（不涉及界面，可在后台线程调用）"""
+    chapters = []
+    line_number = 0
+    last_pos = 0
+    # 先用正则在整段文本上找出可能是标题的行，再逐行精确匹配
+    for match in _CHAPTER_CANDIDATE_RE.finditer(text):
+        start = match.start()
+        line_number += text.count('\n', last_pos, start)
+        last_pos = start
+
+        line_end = text.find('\n', start)
+        title = text[start:line_end if line_end != -1 else len(text)].strip()
+        if _CHAPTER_RE.match(title):
+            chapters.append({
+                'title': title,
+                'position': start,
+                'line_number': line_number
+            })
+    return chapters
+
+def _normalize_color_hex(color_hex):
+    """统一颜色写法（小写、去掉#、展开3位简写），让相同颜色命中同一缓存项"""
+    color_hex = color_hex.strip().lower()
     if color_hex.startswith('#'):
         color_hex = color_hex[1:]
+    if len(color_hex) == 3:
+        color_hex = ''.join(c * 2 for c in color_hex)
+    return color_hex
+
+def _srgb_to_linear(c):
+    """sRGB 分量转线性值的快速近似，只用于亮度阈值判断"""
+    return c * (c * (c * 0.305306011 + 0.682171111) + 0.012522878)
+
+def calculate_luminance(color_hex):
+    """计算颜色的亮度（0-1之间），用于确定字体颜色应该用黑色还是白色"""
+    return _cached_luminance(_normalize_color_hex(color_hex))
+
+@lru_cache(maxsize=256)
+def _cached_luminance(color_hex):
+    """按规范化后的颜色缓存亮度计算结果"""
+    if color_hex == "transparent":
+        return 0.5
 
     try:
-        r = int(color_hex[0:2], 16) / 255.0
-        g = int(color_hex[2:4], 16) / 255.0
-        b = int(color_hex[4:6], 16) / 255.0
-    except:
+        r, g, b = bytes.fromhex(color_hex[:6])
+    except ValueError:
         return 0.5
+    r, g, b = r / 255.0, g / 255.0, b / 255.0
 
-    # 相对亮度计算
-    r = r / 12.92 if r <= 0.03928 else ((r + 0.055) / 1.055) ** 2.4
-    g = g / 12.92 if g <= 0.03928 else ((g + 0.055) / 1.055) ** 2.4
-    b = b / 12.92 if b <= 0.03928 else ((b + 0.055) / 1.055) ** 2.4
+    # 相对亮度计算，sRGB 线性化用三次多项式近似 pow(x, 2.4)，误差小于 0.002
+    r = _srgb_to_linear(r)
+    g = _srgb_to_linear(g)
+    b = _srgb_to_linear(b)
 
     luminance = 0.2126 * r + 0.7152 * g + 0.0722 * b
     return luminance
 
 def get_contrast_color(color_hex):
     """根据背景色返回对比度最高的字体颜色（黑色或白色）"""
-    luminance = calculate_luminance(color_hex)
+    return _cached_contrast_color(_normalize_color_hex(color_hex))
+
+@lru_cache(maxsize=256)
+def _cached_contrast_color(color_hex):
+    """按规范化后的颜色缓存对比色"""
+    luminance = _cached_luminance(color_hex)
     return "#000000" if luminance > 0.5 else "#FFFFFF"
 
+# --- 设置项映射 ---
+
+# 透明度选项文字 -> 窗口不透明度
+_TRANSPARENCY_MAP = {
+    "不透明": 1.0,
+    "10%": 0.9,
+    "20%": 0.8,
+    "30%": 0.7,
+    "40%": 0.6,
+    "50%": 0.5,
+    "60%": 0.4,
+    "70%": 0.3,
+    "80%": 0.2,
+    "90%": 0.1
+}
+# 窗口不透明度 -> 下拉框序号
+_OPACITY_TO_INDEX = {opacity: index for index, opacity in enumerate(_TRANSPARENCY_MAP.values())}
+
+# --- 后台任务 ---
+
+class _DocumentLoadSignals(QObject):
+    finished = pyqtSignal(object, object)  # (QTextDocument, 章节列表或 None)
+
+class _HotkeySignals(QObject):
+    triggered = pyqtSignal(object)  # 要在界面线程执行的回调
+
+class DocumentLoadTask(QRunnable):
+    """在线程池中检测编码、解码全文并构建 QTextDocument，完成后把文档交回界面线程"""
+    def __init__(self, file_path, index_chapters):
+        super().__init__()
+        self.file_path = file_path
+        self.index_chapters = index_chapters
+        self.signals = _DocumentLoadSignals()
+
+    def run(self):
+        text = read_text_file(self.file_path, get_file_encoding(self.file_path))
+        chapters = find_chapters(text) if self.index_chapters else None
+
+        # 一次 setPlainText 建立全部文本块，这是打开大文件时最耗时的部分，放在后台完成；
+        # 布局对象留到界面线程再挂上
+        document = QTextDocument()
+        document.setPlainText(text)
+        document.moveToThread(QCoreApplication.instance().thread())
+        self.signals.finished.emit(document, chapters)
+
 # --- 设置窗口 ---
 
 class SettingsWindow(QWidget):
@@ -318,10 +581,10 @@ class SettingsWindow(QWidget):
         transparency_layout.addWidget(transparency_label)
 
         self.transparency_slider = QComboBox()
-        self.transparency_slider.addItems(["不透明", "10%", "20%", "30%", "40%", "50%", "60%", "70%", "80%", "90%"])
+        self.transparency_slider.addItems(list(_TRANSPARENCY_MAP))
         current_opacity = self.main_window.config.get('window_opacity', 0.9)
-        opacity_index = int((1.0 - current_opacity) * 10)
-        if opacity_index < self.transparency_slider.count():
+        opacity_index = _OPACITY_TO_INDEX.get(round(current_opacity, 1))
+        if opacity_index is not None:
             self.transparency_slider.setCurrentIndex(opacity_index)
         self.transparency_slider.currentTextChanged.connect(self.change_transparency)
         transparency_layout.addWidget(self.transparency_slider)
@@ -392,28 +655,16 @@ class SettingsWindow(QWidget):
 
     def change_transparency(self, transparency_text):
         """改变窗口透明度"""
-        transparency_map = {
-            "不透明": 1.0,
-            "10%": 0.9,
-            "20%": 0.8,
-            "30%": 0.7,
-            "40%": 0.6,
-            "50%": 0.5,
-            "60%": 0.4,
-            "70%": 0.3,
-            "80%": 0.2,
-            "90%": 0.1
-        }
-        opacity = transparency_map.get(transparency_text, 0.9)
+        opacity = _TRANSPARENCY_MAP.get(transparency_text, 0.9)
         self.main_window.setWindowOpacity(opacity)
         self.main_window.config['window_opacity'] = opacity
-        save_config(self.main_window.config)
+        mark_config_dirty()
 
     def change_left_click_mode(self, mode_text):
         """改变左键点击模式"""
         mode = 'move' if mode_text == "移动窗口" else 'page'
         self.main_window.config['left_click_mode'] = mode
-        save_config(self.main_window.config)
+        mark_config_dirty()
 
     def toggle_auto_font_color(self, state):
         """切换自动字体颜色功能"""
@@ -424,7 +675,7 @@ class SettingsWindow(QWidget):
         if auto_enabled:
             self.main_window.auto_adjust_font_color()
 
-        save_config(self.main_window.config)
+        mark_config_dirty()
 
     def toggle_catalog(self, state):
         """切换目录显示"""
@@ -467,13 +718,14 @@ class SettingsWindow(QWidget):
 
     def showEvent(self, event):
         """窗口显示时，确保数据是最新的"""
+        main_window = self.main_window
+        config = main_window.config
         self._update_color_previews()
-        self.size_label.setText(str(self.main_window.font_size))
-        self.font_combo.setCurrentText(self.main_window.font_family)
-        self.auto_color_checkbox.setChecked(self.main_window.config.get('auto_font_color', True))
-        self.catalog_checkbox.setChecked(self.main_window.config.get('show_catalog', False))
-        current_mode = self.main_window.config.get('left_click_mode', 'move')
-        self.left_click_combo.setCurrentIndex(0 if current_mode == 'move' else 1)
+        self.size_label.setText(str(main_window.font_size))
+        self.font_combo.setCurrentText(main_window.font_family)
+        self.auto_color_checkbox.setChecked(config.get('auto_font_color', True))
+        self.catalog_checkbox.setChecked(config.get('show_catalog', False))
+        self.left_click_combo.setCurrentIndex(0 if config.get('left_click_mode', 'move') == 'move' else 1)
         super().showEvent(event)
 
 
@@ -486,10 +738,21 @@ class ReaderWindow(QWidget):
         self._load_variables_from_config()
 
         # 初始化状态变量
-        self.current_scroll_value = 0
+        self.current_scroll_value = 0  # 阅读位置：视口顶部的文本块序号，与排版无关
+        self._pixel_progress = None  # 旧版本保存的像素进度，正文加载后换算
+        self._last_saved_scroll_value = None  # 最近一次记录的滚动位置
+        self._text_loaded = False  # 正文是否已显示并恢复到保存的位置
+        self._pending_font_delta = 0  # 尚未应用的字号变化
+        self._last_page_turn = 0.0  # 上次翻页的时间（time.monotonic）
+        self._document_task = None
         self.is_monitoring_active = False
+        self._native_hotkeys = {}  # RegisterHotKey 的 id -> 回调
+        self._pause_hotkey_added = False  # 暂停/恢复热键是否已注册
         self.auto_font_color = self.config.get('auto_font_color', True)
         self.chapters = []  # 章节列表
+        self._chapters_indexed = False  # 是否已扫描过章节
+        self._applied_colors = None  # 最近一次应用到界面的 (背景色, 字体颜色)
+        self._bg_is_black = self._is_background_black()  # 背景色变化时更新，供鼠标事件使用
 
         # 拖动和调整大小标志
         self._is_dragging = False
@@ -498,13 +761,20 @@ class ReaderWindow(QWidget):
         self._resize_start_pos = QPoint()
         self._resize_start_geom = None
 
+        # 调整窗口大小时合并处理，停下 50ms 后再更新按钮位置和滚动位置
+        self._resize_debounce = QTimer(self)
+        self._resize_debounce.setSingleShot(True)
+        self._resize_debounce.setInterval(50)
+        self._resize_debounce.timeout.connect(self._finalize_resize)
+
         # 设置窗口属性
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
         self.setGeometry(self.window_x, self.window_y, self.window_width, self.window_height)
         self.setWindowOpacity(self.config.get('window_opacity', 0.9))
 
-        # 字体对象
-        self.font = QFont(self.font_family, self.font_size)
+        # 字体对象，按 (字体, 字号) 缓存复用
+        self._font_cache = {}
+        self.font = self._get_font(self.font_family, self.font_size)
 
         # 创建主布局
         self.main_layout = QHBoxLayout(self)
@@ -555,15 +825,16 @@ class ReaderWindow(QWidget):
         reading_layout = QVBoxLayout(self.reading_widget)
         reading_layout.setContentsMargins(10, 10, 10, 10)
 
-        # 使用 QTextEdit 组件来显示文本
-        self.text_edit = QTextEdit()
+        # 使用 QPlainTextEdit 组件来显示文本（纯文本按行布局，比富文本快得多）
+        # 注意其滚动条以行为单位，而不是像素
+        self.text_edit = QPlainTextEdit()
         self.text_edit.setReadOnly(True)
         self.text_edit.setWordWrapMode(QTextOption.WrapMode.WordWrap)
         self.text_edit.setFont(self.font)
         self.text_edit.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.text_edit.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.text_edit.setContentsMargins(0, 0, 0, 0)
-        self.text_edit.setFrameShape(QTextEdit.Shape.NoFrame)
+        self.text_edit.setFrameShape(QPlainTextEdit.Shape.NoFrame)
 
         reading_layout.addWidget(self.text_edit)
 
@@ -592,25 +863,43 @@ class ReaderWindow(QWidget):
         self._create_title_buttons()
 
         # 加载文本文件内容
-        self.encoding = get_file_encoding(self.file_path)
-        self.full_text_content = self._load_text()
-        self._extract_chapters()
         self._load_progress()
-
-        # 初始化显示文本
-        self._show_current_page()
+        self._last_saved_scroll_value = self.current_scroll_value
+        # 编码检测、解码和建立文档都在后台线程完成，先显示占位文字
+        self.text_edit.setPlainText("正在加载…")
+        # 目录隐藏时推迟到第一次显示目录再识别章节
+        self._document_task = DocumentLoadTask(self.file_path, self.config.get('show_catalog', False))
+        self._document_task.signals.finished.connect(self._on_document_loaded)
+        QThreadPool.globalInstance().start(self._document_task)
 
         # 初始化目录显示状态
         if not self.config.get('show_catalog', False):
             self.catalog_widget.hide()
 
-        # 创建设置窗口实例（初始隐藏）
-        self.settings_window = SettingsWindow(self)
+        # 设置窗口在第一次打开时才创建
+        self.settings_window = None
+
+        # 写盘在单个后台线程中按提交顺序执行，不阻塞界面
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+        # keyboard 库的热键注册/注销同样放到单个后台线程，按调用顺序执行
+        self._hotkey_pool = ThreadPoolExecutor(max_workers=1)
 
         # 自动保存定时器
         self.save_timer = QTimer(self)
         self.save_timer.timeout.connect(self._auto_save_progress)
-        self.save_timer.start(5000)  # 每5秒自动保存一次
+        self.save_timer.start(5000)  # 每5秒检查一次，有变化才写盘
+
+        # 窗口获得焦点时使用 Qt 快捷键，不依赖全局监控
+        # keyboard 库不会拦截按键，其全局热键生效期间停用这些快捷键，避免同一按键触发两次
+        self._shortcuts = []
+        for hotkey, callback in self._hotkey_actions():
+            shortcut = QShortcut(QKeySequence(hotkey.title()), self)
+            shortcut.activated.connect(callback)
+            self._shortcuts.append(shortcut)
+
+        # keyboard 库在自己的线程里调用回调，通过信号转到界面线程执行
+        self._hotkey_signals = _HotkeySignals()
+        self._hotkey_signals.triggered.connect(self._run_hotkey_callback)
 
         # 绑定键盘全局监控
         self.toggle_all_monitoring()
@@ -682,10 +971,18 @@ class ReaderWindow(QWidget):
         self.minimize_button.move(self.width() - 3 * button_width - margin - 4, margin)
         self.catalog_button.move(self.width() - 4 * button_width - margin - 6, margin)
 
+        # 缓存标题栏按钮所在区域，鼠标按下时直接判断
+        self._title_hit_rect = (
+            self.close_button.geometry()
+            .united(self.settings_button.geometry())
+            .united(self.minimize_button.geometry())
+            .united(self.catalog_button.geometry())
+        )
+
     def _load_variables_from_config(self):
         """从配置字典加载所有成员变量"""
         self.file_path = self.config.get("file_path", "novel.txt")
-        self.file_memo = os.path.splitext(self.file_path)[0] + "_memo.txt"
+        self.file_memo = os.path.splitext(self.file_path)[0] + "_memo.txt"
         self.font_family = self.config.get("font_family", "Microsoft YaHei")
         self.font_size = self.config.get("font_size", 10)
         self.font_color = self.config.get("font_color", "#E0E0E0")
@@ -702,55 +999,35 @@ class ReaderWindow(QWidget):
             self.lines_per_scroll = 4
         self.config['line_scroll_lines'] = self.lines_per_scroll
 
-    def _load_text(self):
-        """读取整个文本文件的内容到一个字符串"""
-        try:
-            if not os.path.exists(self.file_path):
-                return f"错误：文件 '{self.file_path}' 不存在。\n\n请在配置文件中设置正确的文件路径。"
-
-            with open(self.file_path, encoding=self.encoding, errors='ignore') as f:
-                return f.read()
-        except Exception as e:
-            print(f"读取文件 '{self.file_path}' 错误: {e}")
-            return f"错误：无法加载文本文件。\n{str(e)}"
-
-    def _extract_chapters(self):
-        """提取章节信息"""
-        self.chapters = []
+    def _get_font(self, family, size):
+        """返回缓存的 QFont，避免每次调整字号都重新解析字体"""
+        key = (family, size)
+        font = self._font_cache.get(key)
+        if font is None:
+            if len(self._font_cache) >= FONT_CACHE_SIZE:
+                # 淘汰最早加入的字体
+                self._font_cache.pop(next(iter(self._font_cache)))
+            font = QFont(family, size)
+            self._font_cache[key] = font
+        return font
+
+    def _ensure_chapters_indexed(self):
+        """第一次需要章节信息时才扫描全文（从文档临时取出文本，不长期保留副本）"""
+        if not self._chapters_indexed and self._document_task is None:
+            self._chapters_indexed = True
+            self._populate_catalog(find_chapters(self.text_edit.toPlainText()))
+
+    def _populate_catalog(self, chapters):
+        """用识别出的章节填充目录"""
+        self.chapters = chapters
         self.catalog_list.clear()
-
-        if not self.full_text_content:
-            return
-
-        # 常见的章节标题模式
-        patterns = [
-            r'^第[零一二三四五六七八九十百千0-9]+章\s*.+',
-            r'^第[零一二三四五六七八九十百千0-9]+节\s*.+',
-            r'^Chapter\s+\d+.+',
-            r'^\d+[\s\.、]+.+',
-            r'^[零一二三四五六七八九十百千]+[\s、\.]+.+'
-        ]
-
-        lines = self.full_text_content.split('\n')
-        char_count = 0
-
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if line:
-                # 检查是否匹配章节模式
-                for pattern in patterns:
-                    if re.match(pattern, line, re.IGNORECASE):
-                        self.chapters.append({
-                            'title': line,
-                            'position': char_count,
-                            'line_number': i
-                        })
-                        self.catalog_list.addItem(line)
-                        break
-
-            char_count += len(line) + 1  # +1 for newline
-
-        print(f"找到 {len(self.chapters)} 个章节")
+        # 一次性填充目录，期间暂停重绘和信号
+        self.catalog_list.setUpdatesEnabled(False)
+        self.catalog_list.blockSignals(True)
+        self.catalog_list.addItems([chapter['title'] for chapter in self.chapters])
+        self.catalog_list.blockSignals(False)
+        self.catalog_list.setUpdatesEnabled(True)
+        logger.info("找到 %d 个章节", len(self.chapters))
 
     def jump_to_chapter(self, item):
         """跳转到选中的章节"""
@@ -758,13 +1035,13 @@ class ReaderWindow(QWidget):
         if 0 <= index < len(self.chapters):
             chapter = self.chapters[index]
 
-            # 使用QTextCursor定位
-            cursor = self.text_edit.textCursor()
-            cursor.setPosition(chapter['position'])
+            # 按行号找到章节所在的文本块，比按字符位置定位快
+            block = self.text_edit.document().findBlockByNumber(chapter['line_number'])
+            cursor = QTextCursor(block)
             self.text_edit.setTextCursor(cursor)
             self.text_edit.ensureCursorVisible()
 
-            self.current_scroll_value = self.text_edit.verticalScrollBar().value()
+            self.current_scroll_value = self._first_visible_block()
             self._save_progress()
 
     def toggle_catalog_panel(self, show=None):
@@ -773,33 +1050,46 @@ class ReaderWindow(QWidget):
             show = not self.catalog_widget.isVisible()
 
         if show:
+            self._ensure_chapters_indexed()
             self.catalog_widget.show()
         else:
             self.catalog_widget.hide()
 
         self.config['show_catalog'] = show
-        save_config(self.config)
+        mark_config_dirty()
 
     def _apply_stylesheet(self):
-        """根据配置的背景和字体颜色统一应用样式"""
-        if self.background_color == "transparent":
-            self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
-            self.setStyleSheet("background-color: transparent;")
-            self.reading_widget.setStyleSheet("background-color: transparent;")
-            self.text_edit.setStyleSheet(f"color: {self.font_color}; background-color: transparent; border: none;")
+        """根据配置的背景和字体颜色更新调色板，颜色变化不再重新解析样式表"""
+        colors = (self.background_color, self.font_color)
+        if colors == self._applied_colors:
+            return
+        self._applied_colors = colors
+
+        transparent = self.background_color == "transparent"
+        if transparent:
+            bg_color = QColor(Qt.GlobalColor.transparent)
         else:
-            self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, False)
-            self.setStyleSheet(f"background-color: {self.background_color};")
-            self.reading_widget.setStyleSheet(f"background-color: {self.background_color};")
-            self.text_edit.setStyleSheet(f"color: {self.font_color}; background-color: {self.background_color}; border: none;")
+            bg_color = QColor(self.background_color)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, transparent)
+
+        for widget in (self, self.reading_widget):
+            palette = widget.palette()
+            palette.setColor(QPalette.ColorRole.Window, bg_color)
+            widget.setPalette(palette)
+            widget.setAutoFillBackground(not transparent)
+
+        palette = self.text_edit.palette()
+        palette.setColor(QPalette.ColorRole.Text, QColor(self.font_color))
+        palette.setColor(QPalette.ColorRole.Base, bg_color)
+        self.text_edit.setPalette(palette)
 
     def _is_background_black(self):
         """判断背景颜色是否为纯黑色"""
         color_value = (self.background_color or "").strip().lower()
-        if color_value in {"#000000", "black"}:
+        if color_value in _BLACK_COLOR_NAMES:
             return True
         if color_value.startswith("rgb"):
-            digits = [int(value) for value in re.findall(r'\d+', color_value)]
+            digits = [int(value) for value in _RGB_DIGITS_RE.findall(color_value)]
             if len(digits) >= 3 and all(value == 0 for value in digits[:3]):
                 if len(digits) < 4 or digits[3] > 0:
                     return True
@@ -812,7 +1102,7 @@ class ReaderWindow(QWidget):
 
     def _reset_drag_state_if_needed(self):
         """背景不满足要求时，立即停止拖动"""
-        if not self._is_background_black():
+        if not self._bg_is_black:
             self._is_dragging = False
 
     def auto_adjust_font_color(self):
@@ -824,112 +1114,192 @@ class ReaderWindow(QWidget):
             contrast_color = get_contrast_color(self.background_color)
             self.set_font_color(contrast_color, save=False)
 
-    def _show_current_page(self):
-        """将全部文本加载到QTextEdit，并滚动到当前保存的位置"""
-        if not self.full_text_content:
-            return
-
-        self.text_edit.setText(self.full_text_content)
+    def _on_document_loaded(self, document, chapters):
+        """后台建好的文档一次性换入阅读区，并滚动到上次的阅读位置（全文只保存在文档中）"""
+        self._document_task = None
+        document.setParent(self.text_edit)
+        document.setDefaultFont(self.font)
+        document.setDocumentLayout(QPlainTextDocumentLayout(document))
+        # 占位文档属于编辑器自身，setDocument 会负责释放
+        self.text_edit.setDocument(document)
+        self.text_edit.setWordWrapMode(QTextOption.WrapMode.WordWrap)
+
+        if chapters is not None:
+            self._chapters_indexed = True
+            self._populate_catalog(chapters)
+        elif self.catalog_widget.isVisible():
+            # 加载期间打开了目录，现在补做章节识别
+            self._ensure_chapters_indexed()
 
+        if document.isEmpty():
+            return
         # 使用QTimer延迟设置滚动位置，确保文本已经渲染
         QTimer.singleShot(50, self._restore_scroll_position)
 
+    def _first_visible_block(self):
+        """返回视口顶部的文本块序号"""
+        return self.text_edit.cursorForPosition(QPoint(0, 0)).blockNumber()
+
     def _restore_scroll_position(self):
-        """恢复滚动位置"""
-        max_scroll_value = self.text_edit.verticalScrollBar().maximum()
-        self.current_scroll_value = max(0, min(self.current_scroll_value, max_scroll_value))
-        self.text_edit.verticalScrollBar().setValue(self.current_scroll_value)
+        """把上次阅读的文本块滚动到视口顶部"""
+        self._text_loaded = True
+        if self._pixel_progress is not None and os.path.isfile(self.file_path):
+            self._migrate_pixel_progress()
+        document = self.text_edit.document()
+        self.current_scroll_value = max(0, min(self.current_scroll_value, document.blockCount() - 1))
+        # 滚动条以行为单位，按文本块当前的起始行定位，不受之前排版了多少影响
+        block = document.findBlockByNumber(self.current_scroll_value)
+        self.text_edit.verticalScrollBar().setValue(block.firstLineNumber())
 
     def _scroll_lines(self, line_count: int):
         """按指定行数滚动文本"""
-        if line_count == 0:
+        if line_count == 0 or not self._text_loaded:
             return
         scrollbar = self.text_edit.verticalScrollBar()
-        line_height = self.text_edit.fontMetrics().lineSpacing()
-        delta = line_height * line_count
-        new_value = scrollbar.value() + delta
+        new_value = scrollbar.value() + line_count  # 滚动条单位即为行
         clamped = max(scrollbar.minimum(), min(scrollbar.maximum(), new_value))
         scrollbar.setValue(clamped)
-        self.current_scroll_value = scrollbar.value()
+        self.current_scroll_value = self._first_visible_block()
+
+    def _page_turn_allowed(self):
+        """按住翻页键时限制翻页频率，间隔太短的自动重复直接忽略"""
+        now = time.monotonic()
+        if now - self._last_page_turn < PAGE_TURN_MIN_INTERVAL:
+            return False
+        self._last_page_turn = now
+        return True
 
     def next_page(self, *args):
         """翻到下一页"""
-        self._scroll_lines(self.lines_per_scroll)
+        if self._page_turn_allowed():
+            self._scroll_lines(self.lines_per_scroll)
 
     def prev_page(self):
         """翻到上一页"""
-        self._scroll_lines(-self.lines_per_scroll)
+        if self._page_turn_allowed():
+            self._scroll_lines(-self.lines_per_scroll)
 
     def _auto_save_progress(self):
-        """自动保存进度（由定时器调用）"""
-        self.current_scroll_value = self.text_edit.verticalScrollBar().value()
-        self._save_progress()
+        """自动保存进度（由定时器调用），位置没有变化时不写盘"""
+        if self._text_loaded:
+            self.current_scroll_value = self._first_visible_block()
+            self._save_progress()
+        self._flush_dirty()
 
     def _save_progress(self):
-        """保存当前滚动位置到memo文件"""
-        try:
-            with open(self.file_memo, "w", encoding='utf-8') as f:
-                f.write(str(self.current_scroll_value))
-        except Exception as e:
-            print(f"保存进度时出错: {e}")
+        """把当前滚动位置记入内存，实际写盘由 _flush_dirty 统一完成"""
+        if self.current_scroll_value == self._last_saved_scroll_value:
+            return
         progress_map = self.config.setdefault('reading_progress', {})
         progress_map[self.file_path] = self.current_scroll_value
-        save_config(self.config)
+        self._last_saved_scroll_value = self.current_scroll_value
+        mark_config_dirty()
+
+    def _flush_dirty(self):
+        """把积累的进度和配置修改交给后台线程写入磁盘"""
+        if take_config_dirty():
+            self._io_pool.submit(write_config_files, snapshot_config(self.config))
 
     def _load_progress(self):
-        """从memo文件加载上次的滚动位置"""
-        progress_map = self.config.get('reading_progress', {})
-        saved_value = progress_map.get(self.file_path)
+        """从 reading_progress 加载上次的阅读位置，旧版本的memo文件迁移后删除"""
+        memo_value = self._take_memo_progress()
+        saved_value = self.config.get('reading_progress', {}).get(self.file_path)
         if isinstance(saved_value, int):
             self.current_scroll_value = saved_value
-            return
-        if isinstance(saved_value, str) and saved_value.isdigit():
-            self.current_scroll_value = int(saved_value)
-            return
+            return
+
+        pixel_progress = self.config.get('legacy_pixel_progress', {})
+        if memo_value is not None and self.file_path not in pixel_progress:
+            # memo 文件里同样是旧版本的像素值，记入旧进度，正文加载后再换算
+            pixel_progress = dict(pixel_progress)
+            pixel_progress[self.file_path] = memo_value
+            self.config['legacy_pixel_progress'] = pixel_progress
+            mark_config_dirty()
+        self._pixel_progress = pixel_progress.get(self.file_path)
+
+    def _take_memo_progress(self):
+        """读取旧版本的memo进度文件后将其删除，返回其中的像素值，没有时返回 None"""
+        if not os.path.exists(self.file_memo):
+            return None
+        try:
+            with open(self.file_memo, "r", encoding='utf-8') as f:
+                saved = f.readline().strip()
+            os.remove(self.file_memo)
+        except Exception as e:
+            logger.warning("迁移旧进度文件时出错: %s", e)
+            return None
+        return int(saved) if saved.isdigit() else None
 
-        if os.path.exists(self.file_memo):
-            try:
-                with open(self.file_memo, "r", encoding='utf-8') as f:
-                    saved = f.readline().strip()
-                    if saved.isdigit():
-                        self.current_scroll_value = int(saved)
-                        progress_map[self.file_path] = self.current_scroll_value
-                        save_config(self.config)
-            except Exception as e:
-                print(f"加载进度时出错: {e}")
+    def _block_at_pixel(self, y):
+        """返回文档中纵坐标 y 处的文本块序号，用于换算旧版本的像素进度"""
+        document = self.text_edit.document()
+        layout = document.documentLayout()
+        block = document.firstBlock()
+        bottom = 0.0
+        while block.isValid():
+            # blockBoundingRect 会按当前宽度排版该文本块
+            bottom += layout.blockBoundingRect(block).height()
+            if bottom > y:
+                return block.blockNumber()
+            block = block.next()
+        return max(0, document.blockCount() - 1)
+
+    def _migrate_pixel_progress(self):
+        """把本书旧版本的像素进度换算为文本块序号，换算后从旧进度中移除"""
+        self.current_scroll_value = self._block_at_pixel(self._pixel_progress)
+        self._pixel_progress = None
+        pixel_progress = {
+            path: value for path, value in self.config.get('legacy_pixel_progress', {}).items()
+            if path != self.file_path
+        }
+        if pixel_progress:
+            self.config['legacy_pixel_progress'] = pixel_progress
+        else:
+            self.config.pop('legacy_pixel_progress', None)
+        mark_config_dirty()
 
     def update_font_size(self, delta):
-        """调整字体大小"""
-        self.font_size = max(6, min(72, self.font_size + delta))
-        self.font.setPointSize(self.font_size)
-        self.text_edit.setFont(self.font)
-        self.config['font_size'] = self.font_size
+        """调整字体大小（连续按键时合并为一次重新排版）"""
+        if self._pending_font_delta == 0:
+            QTimer.singleShot(30, self._apply_pending_font_delta)
+        self._pending_font_delta += delta
 
-        if hasattr(self, 'settings_window') and self.settings_window.isVisible():
-            self.settings_window.size_label.setText(str(self.font_size))
+    def _apply_pending_font_delta(self):
+        """把累积的字号变化一次性应用"""
+        delta, self._pending_font_delta = self._pending_font_delta, 0
+        self.update_font_size_direct(self.font_size + delta)
 
     def update_font_size_direct(self, new_size):
         """直接设置字体大小"""
-        self.font_size = max(6, min(72, new_size))
-        self.font.setPointSize(self.font_size)
+        new_size = max(6, min(72, new_size))
+        if new_size == self.font_size:
+            return
+        self.font_size = new_size
+        self.font = self._get_font(self.font_family, self.font_size)
         self.text_edit.setFont(self.font)
         self.config['font_size'] = self.font_size
+        mark_config_dirty()
 
-        if hasattr(self, 'settings_window') and self.settings_window.isVisible():
+        if self.settings_window is not None and self.settings_window.isVisible():
             self.settings_window.size_label.setText(str(self.font_size))
 
     def set_font_family(self, font_family):
         """设置字体家族"""
+        if font_family == self.font_family:
+            return
         self.font_family = font_family
         self.config['font_family'] = font_family
-        self.font.setFamily(font_family)
+        self.font = self._get_font(self.font_family, self.font_size)
         self.text_edit.setFont(self.font)
-        save_config(self.config)
+        mark_config_dirty()
 
     def set_background_color(self, color, save=True):
         """设置背景颜色并更新样式"""
+        if color == self.background_color:
+            return
         self.background_color = color
         self.config['background_color'] = color
+        self._bg_is_black = self._is_background_black()
 
         if self.auto_font_color:
             self.auto_adjust_font_color()
@@ -937,42 +1307,120 @@ class ReaderWindow(QWidget):
         self._apply_stylesheet()
         self._reset_drag_state_if_needed()
         if save:
-            save_config(self.config)
+            mark_config_dirty()
 
     def set_font_color(self, color, save=True):
         """设置字体颜色并更新样式"""
+        if color == self.font_color:
+            return
         self.font_color = color
         self.config['font_color'] = color
         self._apply_stylesheet()
         if save:
-            save_config(self.config)
+            mark_config_dirty()
+
+    def _hotkey_actions(self):
+        """返回 (热键, 回调) 列表，热键使用 keyboard 库的写法"""
+        return [
+            ('down', self.next_page),
+            ('up', self.prev_page),
+            ('alt+up', lambda: self.update_font_size(1)),
+            ('alt+down', lambda: self.update_font_size(-1)),
+            ('ctrl+s', self.toggle_settings_window),
+            ('ctrl+m', self.showMinimized),
+            ('ctrl+d', lambda: self.toggle_catalog_panel()),
+        ]
+
+    def _register_native_hotkeys(self):
+        """通过 RegisterHotKey 注册 Windows 全局热键，消息在 nativeEvent 中处理"""
+        hwnd = int(self.winId())
+        for hotkey_id, (hotkey, callback) in enumerate(self._hotkey_actions(), start=1):
+            modifiers, virtual_key = _parse_win_hotkey(hotkey)
+            if _USER32.RegisterHotKey(hwnd, hotkey_id, modifiers, virtual_key):
+                self._native_hotkeys[hotkey_id] = callback
+            else:
+                logger.warning("注册热键 %s 失败，可能已被其他程序占用", hotkey)
+
+    def _unregister_native_hotkeys(self):
+        """注销所有 Windows 全局热键"""
+        hwnd = int(self.winId())
+        for hotkey_id in self._native_hotkeys:
+            _USER32.UnregisterHotKey(hwnd, hotkey_id)
+        self._native_hotkeys = {}
+
+    def _run_hotkey_callback(self, callback):
+        """在界面线程中执行热键回调"""
+        callback()
+
+    def _keyboard_callback(self, callback):
+        """包装回调，使 keyboard 库触发时转到界面线程执行"""
+        return lambda: self._hotkey_signals.triggered.emit(callback)
+
+    def _set_shortcuts_enabled(self, enabled):
+        """启用或停用窗口内的 Qt 快捷键"""
+        for shortcut in self._shortcuts:
+            shortcut.setEnabled(enabled)
+
+    def _register_keyboard_hotkeys(self):
+        """注册 keyboard 库的全局热键（在后台线程执行，注册较慢时不阻塞界面）"""
+        try:
+            for hotkey, callback in self._hotkey_actions():
+                keyboard.add_hotkey(hotkey, self._keyboard_callback(callback), suppress=True)
+        except Exception as e:
+            logger.error("启动全局监控失败: %s", e)
+            # 注册失败时恢复窗口内的快捷键（回到界面线程执行）
+            self._hotkey_signals.triggered.emit(lambda: self._set_shortcuts_enabled(True))
+
+    def _unregister_keyboard_hotkeys(self):
+        """注销 keyboard 库的全局热键，只保留暂停/恢复热键（在后台线程执行）"""
+        try:
+            keyboard.remove_all_hotkeys()
+            keyboard.add_hotkey('ctrl+alt', self._keyboard_callback(self.toggle_all_monitoring))
+        except Exception as e:
+            logger.error("停止全局监控失败: %s", e)
 
     def start_all_monitoring(self):
         """启动所有键盘热键监控"""
         if not self.is_monitoring_active:
             self.is_monitoring_active = True
             try:
-                keyboard.add_hotkey('down', self.next_page, suppress=True)
-                keyboard.add_hotkey('up', self.prev_page, suppress=True)
-                keyboard.add_hotkey('alt+up', lambda: self.update_font_size(1), suppress=True)
-                keyboard.add_hotkey('alt+down', lambda: self.update_font_size(-1), suppress=True)
-                keyboard.add_hotkey('ctrl+s', self.toggle_settings_window, suppress=True)
-                keyboard.add_hotkey('ctrl+m', self.showMinimized, suppress=True)
-                keyboard.add_hotkey('ctrl+d', lambda: self.toggle_catalog_panel(), suppress=True)
-                print("全局监控已启用")
+                if _USER32 is not None:
+                    self._register_native_hotkeys()
+                else:
+                    self._set_shortcuts_enabled(False)
+                    self._hotkey_pool.submit(self._register_keyboard_hotkeys)
+                logger.info("全局监控已启用")
             except Exception as e:
-                print(f"启动全局监控失败: {e}")
+                logger.error("启动全局监控失败: %s", e)
 
     def stop_all_monitoring(self):
         """停止所有键盘热键监控"""
         if self.is_monitoring_active:
             self.is_monitoring_active = False
             try:
-                keyboard.remove_all_hotkeys()
-                keyboard.add_hotkey('ctrl+alt', self.toggle_all_monitoring)
-                print("全局监控已暂停")
+                if _USER32 is not None:
+                    self._unregister_native_hotkeys()
+                    # RegisterHotKey 不支持只有修饰键的组合，暂停/恢复热键仍由 keyboard 库监听
+                    if not self._pause_hotkey_added:
+                        keyboard.add_hotkey('ctrl+alt', self._keyboard_callback(self.toggle_all_monitoring))
+                        self._pause_hotkey_added = True
+                else:
+                    self._hotkey_pool.submit(self._unregister_keyboard_hotkeys)
+                    self._set_shortcuts_enabled(True)
+                logger.info("全局监控已暂停")
             except Exception as e:
-                print(f"停止全局监控失败: {e}")
+                logger.error("停止全局监控失败: %s", e)
+
+    def nativeEvent(self, event_type, message):
+        """处理 Windows 全局热键消息"""
+        if self._native_hotkeys and bytes(event_type) == b"windows_generic_MSG":
+            msg = ctypes.wintypes.MSG.from_address(int(message))
+            if msg.message == WM_HOTKEY:
+                callback = self._native_hotkeys.get(msg.wParam)
+                if callback is not None:
+                    callback()
+                    return True, 0
+        return super().nativeEvent(event_type, message)
 
     def toggle_all_monitoring(self):
         """切换所有监控的开关状态"""
@@ -983,6 +1431,9 @@ class ReaderWindow(QWidget):
 
     def toggle_settings_window(self):
         """切换设置窗口的显示/隐藏状态"""
+        if self.settings_window is None:
+            self.settings_window = SettingsWindow(self)
+
         if self.settings_window.isVisible():
             self.settings_window.hide()
         else:
@@ -995,24 +1446,24 @@ class ReaderWindow(QWidget):
     # --- 事件处理方法 ---
     def resizeEvent(self, event: QResizeEvent):
         """窗口大小改变事件"""
-        self._update_title_buttons_position()
-        self.current_scroll_value = self.text_edit.verticalScrollBar().value()
+        self._resize_debounce.start()
         super().resizeEvent(event)
 
+    def _finalize_resize(self):
+        """窗口大小停止变化后更新按钮位置并记录滚动位置"""
+        self._update_title_buttons_position()
+        if self._text_loaded:
+            self.current_scroll_value = self._first_visible_block()
+
     def mousePressEvent(self, event: QMouseEvent):
        
         """鼠标按下事件"""
         # 检查是否点击在标题栏按钮区域
-        button_rect = self.close_button.geometry()
-        button_rect = button_rect.united(self.settings_button.geometry())
-        button_rect = button_rect.united(self.minimize_button.geometry())
-        button_rect = button_rect.united(self.catalog_button.geometry())
-
-        if button_rect.contains(event.position().toPoint()):
+        if self._title_hit_rect.contains(event.position().toPoint()):
             super().mousePressEvent(event)
             return
 
-        can_drag_window = self._is_background_black()
+        can_drag_window = self._bg_is_black
 
         if event.button() == Qt.MouseButton.LeftButton:
             left_click_mode = self.config.get('left_click_mode', 'move')
@@ -1041,7 +1492,12 @@ class ReaderWindow(QWidget):
 
     def mouseMoveEvent(self, event: QMouseEvent):
         """鼠标移动事件"""
-        can_drag_window = self._is_background_black()
+        # 既不在拖动也不在调整大小时什么都不用做
+        if not (self._is_dragging or self._is_resizing):
+            event.accept()
+            return
+
+        can_drag_window = self._bg_is_black
 
         # 左键或右键拖动窗口（仅在背景为黑色时允许）
         if self._is_dragging:
@@ -1086,24 +1542,35 @@ class ReaderWindow(QWidget):
         if self.catalog_widget.isVisible():
             self.config['catalog_width'] = self.catalog_widget.width()
 
-        # 保存阅读进度
-        self.current_scroll_value = self.text_edit.verticalScrollBar().value()
+        # 保存阅读进度（正文尚未加载完成时保留原进度）
+        if self._text_loaded:
+            self.current_scroll_value = self._first_visible_block()
         self._save_progress()
 
-        # 保存配置文件
-        save_config(self.config)
+        # 写入所有未保存的修改
+        mark_config_dirty()
+        self._flush_dirty()
 
         # 清理资源
         self.save_timer.stop()
         self.stop_all_monitoring()
+        self._hotkey_pool.shutdown(wait=True)
         keyboard.unhook_all()
+        self._io_pool.shutdown(wait=True)  # 等待后台写盘完成
 
-        print("窗口关闭，配置和进度已保存。")
+        logger.info("窗口关闭，配置和进度已保存。")
         event.accept()
 
 
 # --- 程序入口 ---
 if __name__ == "__main__":
+    # 日志写入文件，隐藏控制台时输出也不会阻塞界面线程
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+        handlers=[RotatingFileHandler(LOG_PATH, maxBytes=1024 * 1024, backupCount=1, encoding="utf-8")]
+    )
+
     app = QApplication(sys.argv)
 
     # 设置应用程序属性